@@ -27,8 +27,9 @@ setuptools.setup(
     python_requires=">=3.6",
     install_requires=[
         "numpy",
-        "scikit-learn",
-        "pandas",
         "scipy",
     ],
+    extras_require={
+        "numba": ["numba"],
+    },
 )
@@ -1,16 +1,49 @@
 """Module for the computation of several association metrics between variables."""
 
 import numpy as np
-from pandas import crosstab
-from scipy.stats import (
-    chi2_contingency,
-    kendalltau,
-    linregress,
-    pointbiserialr,
-    spearmanr,
+from relazioni._kernels import (
+    _kendall_inversions,
+    _pearson_njit,
+    _spearman_sumsqd,
+    _theils_u_njit,
 )
-from utils.consistency import check_variables, check_binary_categorical
-from sklearn.metrics import matthews_corrcoef
+from utils.consistency import (
+    _ranks,
+    check_variables,
+    check_variables_n,
+    check_binary_categorical,
+)
+
+__all__ = [
+    "theils_u",
+    "matthews_corr",
+    "cramers_v",
+    "kendalls_corr",
+    "spearmans_corr",
+    "spearman_matrix",
+    "pointbiserial_corr",
+    "pearson_corr",
+    "pearson_matrix",
+    "partial_corr",
+]
+
+if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+
+    def _popcount(a: np.ndarray) -> int:
+        """Count the set bits of a packed uint8 array."""
+        return int(np.bitwise_count(a).sum())
+
+else:
+
+    def _popcount(a: np.ndarray) -> int:
+        """Count the set bits of a packed uint8 array."""
+        return int.from_bytes(a.tobytes(), "little").bit_count()
+
+
+def _has_nan(v: np.ndarray) -> bool:
+    """Check for NaN via one O(n) sum; non-float dtypes cannot hold any."""
+    return v.dtype.kind in "fc" and bool(np.isnan(np.sum(v)))
+
 
 def theils_u(v1: np.ndarray, v2: np.ndarray) -> float:
     """
@@ -54,9 +87,19 @@ def theils_u(v1: np.ndarray, v2: np.ndarray) -> float:
     """
     check_variables(v1, v2)
 
-    out = np.sqrt(np.sum(((v1[1:] - v2[1:]) / v2[:-1]) ** 2)) / np.sqrt(
-        np.sum(((v2[1:] - v2[:-1]) / v2[:-1]) ** 2)
-    )
+    if _theils_u_njit is not None:
+        # Numba specializes the kernel per input dtype, so integer and
+        # float32 inputs run as-is without materializing a float64 copy.
+        out = _theils_u_njit(np.ascontiguousarray(v1), np.ascontiguousarray(v2))
+    else:
+        v1 = np.ascontiguousarray(v1, dtype=np.float64)
+        v2 = np.ascontiguousarray(v2, dtype=np.float64)
+
+        d = v2[:-1]
+        num = (v1[1:] - v2[1:]) / d
+        den = (v2[1:] - d) / d
+
+        out = np.sqrt((num @ num) / (den @ den))
 
     return out
 
@@ -104,7 +147,34 @@ def matthews_corr(v1: np.ndarray, v2: np.ndarray) -> float:
     """
     check_binary_categorical(v1, v2)
 
-    out = matthews_corrcoef(v1, v2)
+    # Both variables are binary, so the 2x2 confusion counts and the
+    # closed-form ratio are all that is needed; sklearn's multi-class MCC
+    # path (label encoding plus a full confusion matrix) is overkill here.
+    # The larger of each variable's two labels (in sort order, so string
+    # labels such as "yes"/"no" work as well) is treated as its positive
+    # class. Note that when the two arrays use different label sets, this
+    # per-array convention can differ from sklearn's, which encodes both
+    # arrays over the union of their labels.
+    p = v1 == np.unique(v1)[-1]
+    q = v2 == np.unique(v2)[-1]
+
+    # Bit-pack the masks so each popcount covers 8 observations per byte.
+    # The packed padding bits are 0, so combinations involving a negation
+    # are chosen to keep them 0 and tn is derived from the total instead.
+    P = np.packbits(p)
+    Q = np.packbits(q)
+
+    tp = _popcount(P & Q)
+    fp = _popcount(~P & Q)
+    fn = _popcount(P & ~Q)
+    tn = len(v1) - tp - fp - fn
+
+    num = tp * tn - fp * fn
+    den = np.sqrt(
+        float(tp + fp) * float(tp + fn) * float(tn + fp) * float(tn + fn)
+    )
+
+    out = 0.0 if den == 0 else num / den
 
     return out
 
@@ -151,10 +221,21 @@ def cramers_v(v1: np.ndarray, v2: np.ndarray) -> float:
     """
     check_variables(v1, v2)
 
-    ct = crosstab(v1, v2).values
+    _, i1 = np.unique(v1, return_inverse=True)
+    _, i2 = np.unique(v2, return_inverse=True)
+
+    ct = np.zeros((i1.max() + 1, i2.max() + 1), dtype=np.int64)
+    np.add.at(ct, (i1, i2), 1)
+
+    # chi2_contingency would also compute the p-value and dof; only the
+    # statistic is needed here, so compute it directly from the table.
+    row = ct.sum(1, keepdims=True)
+    col = ct.sum(0, keepdims=True)
+    n = ct.sum()
+
+    exp = row * col / n
+    X2 = ((ct - exp) ** 2 / exp).sum()
 
-    X2 = chi2_contingency(ct, correction = False)[0]
-    n = ct.sum().sum()
     dof = min(ct.shape) - 1
 
     out = np.sqrt(X2 / (n * dof))
@@ -217,7 +298,34 @@ def kendalls_corr(v1: np.ndarray, v2: np.ndarray) -> float:
     """
     check_variables(v1, v2)
 
-    out = kendalltau(v1, v2).correlation
+    n = len(v1)
+
+    if n < 2:
+        # The coefficient is undefined for fewer than two observations;
+        # kendalltau likewise returns nan.
+        return np.nan
+
+    if _has_nan(v1) or _has_nan(v2):
+        # NaN never compares equal, so the tie checks cannot flag it and it
+        # would take the inversion path; kendalltau's default nan_policy
+        # propagates it.
+        return np.nan
+
+    order = v1.argsort()
+    v1s = v1[order]
+
+    ties = np.any(v1s[1:] == v1s[:-1]) or np.any(np.diff(np.sort(v2)) == 0)
+
+    if ties or _kendall_inversions is None:
+        # Ties need the tau-b correction; let scipy handle them.
+        from scipy.stats import kendalltau
+
+        out = kendalltau(v1, v2).correlation
+    else:
+        # Knight (1966): sort by v1, then the number of inversions left in
+        # v2 is the number of discordant pairs.
+        d = _kendall_inversions(np.ascontiguousarray(v2[order]))
+        out = 1 - 4 * d / (n * (n - 1))
 
     return out
 
@@ -277,7 +385,91 @@ def spearmans_corr(v1: np.ndarray, v2: np.ndarray) -> float:
     """
     check_variables(v1, v2)
 
-    out = spearmanr(v1, v2).correlation
+    n = len(v1)
+
+    if n < 2:
+        # The coefficient is undefined for fewer than two observations;
+        # spearmanr likewise returns nan.
+        return np.nan
+
+    if _has_nan(v1) or _has_nan(v2):
+        # NaN defeats the tie checks and ranks as the largest value, so it
+        # must be caught here; spearmanr's default nan_policy propagates it.
+        return np.nan
+
+    if len(np.unique(v1)) < n or len(np.unique(v2)) < n:
+        # Ties require midranks; rank once and let Pearson on the ranks
+        # handle the correction.
+        from scipy.stats import rankdata
+
+        out = np.corrcoef(rankdata(v1), rankdata(v2))[0, 1]
+    else:
+        # Closed form 1 - 6*Σd²/(n(n²-1)), valid when there are no ties.
+        out = 1 - 6 * _spearman_sumsqd(_ranks(v1), _ranks(v2)) / (n * (n * n - 1))
+
+    return out
+
+
+def spearman_matrix(X: np.ndarray) -> np.ndarray:
+    """
+    Compute the pairwise Spearman's rank correlation matrix of the columns of X.
+
+    Computing all pairs through repeated `spearmans_corr` calls ranks every
+    column once per pair, paying the O(n log n) sorting cost N² times. This
+    entry point ranks each column exactly once and correlates the rank matrix
+    in a single `np.corrcoef` call, which is the appropriate tool when
+    correlating many variables at once (e.g. exploratory data analysis over
+    the columns of a dataset).
+
+    Parameters
+    ----------
+    X : array_like
+        A 2-D array where each column is a variable and each row an
+        observation.
+
+    Returns
+    -------
+    out : np.ndarray
+        The symmetric matrix of Spearman's rank correlation coefficients
+        between all pairs of columns.
+    """
+    if not isinstance(X, np.ndarray):
+        raise ValueError(f"X's type = {type(X)} must be of type np.ndarray.")
+
+    if X.ndim != 2:
+        raise ValueError(
+            f"Number of array dimensions of X = {X.ndim} mus be equal to 2"
+        )
+
+    Xs = np.sort(X, axis=0)
+
+    # NaN defeats the tie check below and ranks as the largest value; it
+    # sorts last, so the bottom sorted row flags the columns whose pairs
+    # must propagate nan (matching spearmanr's default nan_policy).
+    nan_cols = None
+    if X.dtype.kind in "fc" and len(Xs):
+        nan_cols = np.isnan(Xs[-1])
+
+    if np.any(Xs[1:] == Xs[:-1]):
+        # Ties require midranks; rank once and let Pearson on the ranks
+        # handle the correction.
+        from scipy.stats import rankdata
+
+        ranks = rankdata(X, axis=0)
+    else:
+        # One argsort per column plus a scatter of the positions, instead
+        # of the double-argsort rank trick.
+        order = np.argsort(X, axis=0)
+        ranks = np.empty(X.shape, dtype=np.float64)
+        np.put_along_axis(
+            ranks, order, np.arange(X.shape[0], dtype=np.float64)[:, None], axis=0
+        )
+
+    out = np.corrcoef(ranks, rowvar=False)
+
+    if nan_cols is not None and nan_cols.any():
+        out[nan_cols, :] = np.nan
+        out[:, nan_cols] = np.nan
 
     return out
 
@@ -347,12 +539,19 @@ def pointbiserial_corr(v1: np.ndarray, v2: np.ndarray) -> float:
     """
     check_variables(v1, v2)
 
+    from scipy.stats import pointbiserialr
+
     out = pointbiserialr(v1, v2).correlation
 
     return out
 
 
-def pearson_corr(v1: np.ndarray, v2: np.ndarray) -> float:
+def pearson_corr(
+    v1: np.ndarray,
+    v2: np.ndarray,
+    _check=check_variables,
+    _pearson=_pearson_njit,
+) -> float:
     """
     Compute Pearson's correlation coefficient.
 
@@ -415,9 +614,71 @@ def pearson_corr(v1: np.ndarray, v2: np.ndarray) -> float:
         Pearson correlation coefficient.
 
     """
-    check_variables(v1, v2)
+    # The hot callables are bound as default arguments so repeated calls
+    # resolve them as locals rather than via LOAD_GLOBAL lookups.
+    _check(v1, v2)
 
-    out = np.corrcoef(v1, v2)[0, 1]
+    if _pearson is not None:
+        out = _pearson(v1, v2)
+    else:
+        # np.corrcoef would stack the inputs and build a 2x2 covariance
+        # matrix; three dot products on the centered arrays give the same
+        # scalar.
+        v1c = v1 - v1.mean()
+        v2c = v2 - v2.mean()
+
+        out = (v1c @ v2c) / np.sqrt((v1c @ v1c) * (v2c @ v2c))
+
+    return out
+
+
+def pearson_matrix(X: np.ndarray) -> np.ndarray:
+    """
+    Compute the pairwise Pearson correlation matrix of the columns of X.
+
+    Computing all pairs through repeated `pearson_corr` calls dispatches
+    O(N²) Python calls and recenters every column once per pair. This entry
+    point centers each column once and computes the Gram matrix with a
+    single BLAS symmetric rank-k update (`dsyrk`), which only fills one
+    triangle and is roughly half the work of a general matrix product.
+
+    Parameters
+    ----------
+    X : array_like
+        A 2-D array where each column is a variable and each row an
+        observation.
+
+    Returns
+    -------
+    out : np.ndarray
+        The symmetric matrix of Pearson correlation coefficients between
+        all pairs of columns.
+    """
+    if not isinstance(X, np.ndarray):
+        raise ValueError(f"X's type = {type(X)} must be of type np.ndarray.")
+
+    if X.ndim != 2:
+        raise ValueError(
+            f"Number of array dimensions of X = {X.ndim} mus be equal to 2"
+        )
+
+    n = X.shape[0]
+
+    if n < 2:
+        # Correlation is undefined for fewer than two observations;
+        # np.corrcoef likewise produces an all-nan matrix.
+        return np.full((X.shape[1], X.shape[1]), np.nan)
+
+    from scipy.linalg.blas import dsyrk
+
+    Xc = np.asfortranarray(X - X.mean(0), dtype=np.float64)
+
+    G = dsyrk(1.0 / (n - 1), Xc, trans=1, lower=1)
+    G = G + G.T - np.diag(G.diagonal())
+
+    d = np.sqrt(G.diagonal())
+
+    out = G / np.outer(d, d)
 
     return out
 
@@ -496,17 +757,19 @@ def partial_corr(v1: np.ndarray, v2: np.ndarray, v3: np.ndarray) -> float:
     out : float
         R or the root means square of the coefficient of determination.
     """
-    check_variables(v1, v2)
-    check_variables(v2, v3)
-
-    slope_v1_v3, intercept_v1_v3, r_v1_v3, p_v1_v3, se_v1_v3 = linregress(v3, v1)
-
-    res_v1_v3 = v1 - (intercept_v1_v3 + slope_v1_v3 * v3)
-
-    slope_v2_v3, intercept_v2_v3, r_v2_v3, p_v2_v3, se_v2_v3 = linregress(v3, v2)
-
-    res_v2_v3 = v2 - (intercept_v2_v3 + slope_v2_v3 * v3)
-
-    out = np.corrcoef(res_v1_v3, res_v2_v3)[0, 1]
+    check_variables_n(v1, v2, v3)
+
+    # Partial-correlation identity: equal to correlating the residuals of
+    # v1 and v2 regressed on v3, without fitting either regression.
+    if _pearson_njit is not None:
+        # Three single-pass kernel calls; no 3xN stacked copy.
+        r12 = _pearson_njit(v1, v2)
+        r13 = _pearson_njit(v1, v3)
+        r23 = _pearson_njit(v2, v3)
+    else:
+        C = np.corrcoef(np.vstack([v1, v2, v3]))
+        r12, r13, r23 = C[0, 1], C[0, 2], C[1, 2]
+
+    out = (r12 - r13 * r23) / np.sqrt((1 - r13 * r13) * (1 - r23 * r23))
 
     return out
@@ -2,6 +2,74 @@
 
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _count_distinct_up_to_3(v):
+        a = v[0]
+        b = a
+        seen = 1
+
+        for x in v:
+            if x != a:
+                if seen == 1:
+                    b = x
+                    seen = 2
+                elif x != b:
+                    return 3
+
+        return seen
+
+    @njit(cache=True)
+    def _rank_scatter(order, ranks):
+        for i in range(order.size):
+            ranks[order[i]] = i
+
+else:
+    _count_distinct_up_to_3 = None
+    _rank_scatter = None
+
+
+def _ranks(x: np.ndarray) -> np.ndarray:
+    """
+    Compute the 0-based ranks of x, assuming no ties.
+
+    `x.argsort().argsort()` sorts twice; a single argsort followed by a
+    scatter of the positions gives the same ranks with one O(n log n) sort
+    instead of two.
+    """
+    order = x.argsort()
+    ranks = np.empty(order.shape[0], dtype=np.intp)
+
+    if _rank_scatter is not None:
+        _rank_scatter(order, ranks)
+    else:
+        ranks[order] = np.arange(order.shape[0])
+
+    return ranks
+
+
+def _n_unique_capped(v: np.ndarray) -> int:
+    """
+    Count the distinct values of v, stopping at 3.
+
+    `np.unique` sorts the whole array to answer what is really an O(n)
+    question; the jitted scan bails out as soon as a third distinct value is
+    seen. Non-numeric dtypes (and a missing Numba install) fall back to
+    `np.unique`.
+    """
+    if _count_distinct_up_to_3 is not None and len(v) and v.dtype.kind in "biuf":
+        return _count_distinct_up_to_3(v)
+
+    return len(np.unique(v))
+
+
 def check_variables(v1: np.ndarray, v2: np.ndarray) -> None:
     """
     Check that variables are consistent in terms of their data structure type and dimensions.
@@ -13,15 +81,16 @@ def check_variables(v1: np.ndarray, v2: np.ndarray) -> None:
     v2 : array_like
         A 1-D array containing multiple variables and observations.
     """
-    if type(v1) != np.ndarray:
+    # This runs on every public API call and can dominate the metric itself
+    # on small inputs, so keep it to the minimum of attribute lookups:
+    # isinstance (also correct for ndarray subclasses) plus one ndim and one
+    # shape read per variable.
+    if not isinstance(v1, np.ndarray):
         raise ValueError(f"v1's type = {type(v1)} must be of type np.ndarray.")
 
-    if type(v2) != np.ndarray:
+    if not isinstance(v2, np.ndarray):
         raise ValueError(f"v2's type = {type(v2)} must be of type np.ndarray.")
 
-    if len(v1) != len(v2):
-        raise ValueError(f"Length of v1 = {len(v1)} and v2 = {len(v2)} must be equal.")
-
     if v1.ndim != 1:
         raise ValueError(
             f"Number of array dimensions of v1 = {v1.ndim} mus be equal to 1"
@@ -32,6 +101,42 @@ def check_variables(v1: np.ndarray, v2: np.ndarray) -> None:
             f"Number of array dimensions of v2 = {v2.ndim} mus be equal to 1"
         )
 
+    if v1.shape[0] != v2.shape[0]:
+        raise ValueError(
+            f"Length of v1 = {v1.shape[0]} and v2 = {v2.shape[0]} must be equal."
+        )
+
+
+def check_variables_n(*vs: np.ndarray) -> None:
+    """
+    Check that any number of variables are consistent in terms of their data structure type and dimensions.
+
+    Unlike pairwise `check_variables` calls, each variable is validated
+    exactly once regardless of how many are passed.
+
+    Parameters
+    ----------
+    *vs : array_like
+        1-D arrays containing multiple variables and observations.
+    """
+    length = None
+
+    for i, v in enumerate(vs, start=1):
+        if not isinstance(v, np.ndarray):
+            raise ValueError(f"v{i}'s type = {type(v)} must be of type np.ndarray.")
+
+        if v.ndim != 1:
+            raise ValueError(
+                f"Number of array dimensions of v{i} = {v.ndim} mus be equal to 1"
+            )
+
+        if length is None:
+            length = v.shape[0]
+        elif v.shape[0] != length:
+            raise ValueError(
+                f"Length of v1 = {length} and v{i} = {v.shape[0]} must be equal."
+            )
+
 
 def check_binary_categorical(v1: np.ndarray, v2: np.ndarray) -> None:
     """
@@ -46,14 +151,12 @@ def check_binary_categorical(v1: np.ndarray, v2: np.ndarray) -> None:
     """
     check_variables(v1, v2)
 
-    v1_unique = np.unique(v1)
-
-    if len(v1_unique) != 2:
+    if _n_unique_capped(v1) != 2:
         raise ValueError(
-            f"v1 contains more than one or two unique values ({v1_unique})."
+            f"v1 contains more than one or two unique values ({np.unique(v1)})."
         )
 
-    v2_unique = np.unique(v2)
-
-    if len(v2_unique) != 2:
-        raise ValueError(f"v2 contains more than one two unique values ({v2_unique}).")
+    if _n_unique_capped(v2) != 2:
+        raise ValueError(
+            f"v2 contains more than one two unique values ({np.unique(v2)})."
+        )
@@ -96,6 +96,17 @@ class TestAssociations(unittest.TestCase):
             
         self.assertAlmostEqual(0.9, associations.spearmans_corr(v1, v2))
 
+    def test_spearman_matrix(self):
+        v1, v2 = np.array([35, 23, 47, 17, 10, 43, 9, 6, 28]), \
+            np.array([30, 33, 45, 23, 8, 49, 12, 4, 31])
+
+        out = associations.spearman_matrix(np.column_stack((v1, v2)))
+
+        self.assertAlmostEqual(1.0, out[0, 0])
+        self.assertAlmostEqual(1.0, out[1, 1])
+        self.assertAlmostEqual(0.9, out[0, 1])
+        self.assertAlmostEqual(0.9, out[1, 0])
+
     def test_pointbiserial_corr(self):
         v1, v2 = np.array([23, 15, 16, 25, 20, 17, 18, 14, 12, 19, 21, 22, 16, 21, 16, 11, 24, 21, 18, 15, 19, 22, 13, 24]), \
             np.array(([1] * 11) + ([0] * 13))
@@ -114,6 +125,16 @@ class TestAssociations(unittest.TestCase):
 
         self.assertAlmostEqual(0.755928946, associations.pearson_corr(v1, v2))
 
+    def test_pearson_matrix(self):
+        v1, v2 = np.array([6, 8, 10]), np.array([12, 10, 20])
+
+        out = associations.pearson_matrix(np.column_stack((v1, v2)))
+
+        self.assertAlmostEqual(1.0, out[0, 0])
+        self.assertAlmostEqual(1.0, out[1, 1])
+        self.assertAlmostEqual(0.755928946, out[0, 1])
+        self.assertAlmostEqual(0.755928946, out[1, 0])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file